@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Ollama Model Blob Sync
+Copies only the sha256 blobs missing on the target, in parallel chunks,
+with resumable partial transfers and streaming digest verification.
+
+Source and target are Ollama model directories (the folder holding
+manifests/ and blobs/), e.g. /root/.ollama/models, a mounted SSD, or
+another Orin's model directory mounted over NFS/sshfs.
+
+Usage:
+  python3 sync-ollama-models.py SRC DST [model ...]
+  python3 sync-ollama-models.py /root/.ollama/models /mnt/ssd/ollama/models
+  python3 sync-ollama-models.py /root/.ollama/models /mnt/orin2/models dolphin-llama3:8b
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_REGISTRY = "registry.ollama.ai"
+DEFAULT_NAMESPACE = "library"
+DEFAULT_TAG = "latest"
+
+PARTIAL_SUFFIX = ".sync-partial"
+STATE_SUFFIX = ".sync-state"
+STATE_INTERVAL = 2.0  # seconds between flushed resume checkpoints
+
+
+def format_size(num_bytes):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}TB"
+
+
+def blob_filename(digest):
+    """Ollama stores sha256:abc... as blobs/sha256-abc..."""
+    return digest.replace(":", "-")
+
+
+def manifest_path(models_dir, model_name):
+    """Resolve [host/][namespace/]model[:tag] to its manifest file"""
+    name, _, tag = model_name.partition(":")
+    parts = name.split("/")
+    if len(parts) == 1:
+        parts = [DEFAULT_REGISTRY, DEFAULT_NAMESPACE] + parts
+    elif len(parts) == 2:
+        parts = [DEFAULT_REGISTRY] + parts
+    return Path(models_dir, "manifests", *parts, tag or DEFAULT_TAG)
+
+
+def find_manifests(models_dir, models=None):
+    """Return manifest paths for the requested models, or all of them"""
+    if models:
+        paths = [manifest_path(models_dir, m) for m in models]
+        missing = [str(p) for p in paths if not p.is_file()]
+        if missing:
+            raise FileNotFoundError(f"Manifest not found: {', '.join(missing)}")
+        return paths
+
+    root = Path(models_dir, "manifests")
+    return sorted(p for p in root.rglob("*") if p.is_file())
+
+
+def manifest_blobs(path):
+    """Return {digest: size} for the config and layers of a manifest"""
+    with open(path) as f:
+        manifest = json.load(f)
+
+    blobs = {}
+    for entry in [manifest.get("config")] + manifest.get("layers", []):
+        if entry and entry.get("digest"):
+            blobs[entry["digest"]] = entry.get("size")
+    return blobs
+
+
+def hash_file(path, chunk_size):
+    """Full sha256 of a file on disk, only used with --verify-existing"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            hasher.update(data)
+    return "sha256:" + hasher.hexdigest()
+
+
+class BlobSyncer:
+    def __init__(self, src_dir, dst_dir, workers=4, chunk_size=16 * 1024 * 1024,
+                 verify_existing=False, dry_run=False):
+        self.src_dir = Path(src_dir)
+        self.dst_dir = Path(dst_dir)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.verify_existing = verify_existing
+        self.dry_run = dry_run
+        self.bytes_copied = 0
+
+    def is_present(self, digest, size):
+        """Check whether a blob already exists intact on the target"""
+        path = self.dst_dir / "blobs" / blob_filename(digest)
+        if not path.is_file():
+            return False
+        if size is not None and path.stat().st_size != size:
+            return False
+        if self.verify_existing:
+            return hash_file(path, self.chunk_size) == digest
+        return True
+
+    def load_state(self, state_path, digest, size, num_chunks):
+        """Number of chunks already written, flushed and verified by a previous run"""
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        if (not isinstance(state, dict) or state.get("digest") != digest
+                or state.get("size") != size or state.get("chunk_size") != self.chunk_size):
+            return 0
+        done = state.get("done")
+        if type(done) is not int or not 0 <= done <= num_chunks:
+            return 0
+        return done
+
+    def save_state(self, state_path, digest, size, done):
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"digest": digest, "size": size,
+                       "chunk_size": self.chunk_size, "done": done}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_path)
+
+    def stream_chunks(self, pool, func, indices, hasher, on_chunk=None):
+        """Run func over chunk indices in parallel, hashing results in order"""
+        window = self.workers * 2
+        pending = [pool.submit(func, i) for i in indices[:window]]
+        total = 0
+        for n, index in enumerate(indices):
+            data = pending.pop(0).result()
+            if n + window < len(indices):
+                pending.append(pool.submit(func, indices[n + window]))
+
+            hasher.update(data)
+            total += len(data)
+            if on_chunk:
+                on_chunk(index)
+        return total
+
+    def copy_blob(self, digest):
+        """
+        Copy one blob, retrying once from scratch if a resumed copy fails its
+        digest check (the resumed prefix on the target was bad, not the source).
+        """
+        if not self.copy_blob_attempt(digest, resume=True):
+            print("  ⚠ Resumed copy failed digest check, restarting from scratch")
+            self.copy_blob_attempt(digest, resume=False)
+
+    def copy_blob_attempt(self, digest, resume):
+        """
+        Copy one blob in parallel chunks. Returns False if a resumed copy
+        failed its digest check, so the caller can retry without resuming.
+
+        Chunks are written with pwrite from a pool of workers, but fed to the
+        hasher in order as they complete, so the digest is verified while
+        streaming. The contiguous verified prefix is recorded in the state
+        file every STATE_INTERVAL seconds, only after an fdatasync, so the
+        resume marker never gets ahead of what is on disk. On resume that
+        prefix is read back from the target to rebuild the hash and the
+        rest is copied from the source.
+        """
+        name = blob_filename(digest)
+        src_path = self.src_dir / "blobs" / name
+        dst_path = self.dst_dir / "blobs" / name
+        partial_path = dst_path.with_name(name + PARTIAL_SUFFIX)
+        state_path = dst_path.with_name(name + STATE_SUFFIX)
+
+        size = src_path.stat().st_size
+        num_chunks = max(1, -(-size // self.chunk_size))
+        resumed = 0
+        if resume and partial_path.exists():
+            resumed = self.load_state(state_path, digest, size, num_chunks)
+        if resumed:
+            print(f"  ↻ Resuming at chunk {resumed}/{num_chunks}")
+
+        src_fd = os.open(src_path, os.O_RDONLY)
+        dst_fd = os.open(partial_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(dst_fd, size)
+
+            def read_back(index):
+                return os.pread(dst_fd, self.chunk_size, index * self.chunk_size)
+
+            def transfer(index):
+                offset = index * self.chunk_size
+                data = os.pread(src_fd, self.chunk_size, offset)
+                view = memoryview(data)
+                while view:
+                    written = os.pwrite(dst_fd, view, offset)
+                    view = view[written:]
+                    offset += written
+                return data
+
+            last_flush = time.monotonic()
+
+            def checkpoint(index):
+                nonlocal last_flush
+                if time.monotonic() - last_flush >= STATE_INTERVAL:
+                    os.fdatasync(dst_fd)
+                    self.save_state(state_path, digest, size, index + 1)
+                    last_flush = time.monotonic()
+
+            hasher = hashlib.sha256()
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                read_start = time.monotonic()
+                verified = self.stream_chunks(
+                    pool, read_back, list(range(resumed)), hasher)
+                read_elapsed = time.monotonic() - read_start
+
+                start_time = time.monotonic()
+                copied = self.stream_chunks(
+                    pool, transfer, list(range(resumed, num_chunks)), hasher, checkpoint)
+                os.fdatasync(dst_fd)
+                elapsed = time.monotonic() - start_time
+        finally:
+            os.close(src_fd)
+            os.close(dst_fd)
+
+        actual = "sha256:" + hasher.hexdigest()
+        if actual != digest:
+            partial_path.unlink()
+            state_path.unlink(missing_ok=True)
+            if resumed:
+                return False
+            raise ValueError(f"Digest mismatch for {name}: got {actual}")
+
+        os.replace(partial_path, dst_path)
+        state_path.unlink(missing_ok=True)
+        self.bytes_copied += copied
+
+        if resumed:
+            read_rate = verified / read_elapsed if read_elapsed > 0 else 0
+            print(f"  ↻ Re-verified {format_size(verified)} in {read_elapsed:.1f}s "
+                  f"({format_size(read_rate)}/s)")
+        rate = copied / elapsed if elapsed > 0 else 0
+        print(f"  ✅ {format_size(copied)} in {elapsed:.1f}s ({format_size(rate)}/s)")
+        return True
+
+    def copy_manifest(self, path):
+        """Install a manifest on the target once all its blobs are in place"""
+        relative = path.relative_to(self.src_dir)
+        target = self.dst_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".tmp")
+        tmp_path.write_bytes(path.read_bytes())
+        os.replace(tmp_path, target)
+
+    def sync(self, models=None):
+        manifests = find_manifests(self.src_dir, models)
+        blobs = {}
+        for path in manifests:
+            blobs.update(manifest_blobs(path))
+
+        missing = {d: s for d, s in blobs.items() if not self.is_present(d, s)}
+        total = sum(s or 0 for s in missing.values())
+
+        print(f"Manifests: {len(manifests)}")
+        print(f"Blobs:     {len(blobs)} referenced, {len(missing)} missing on target "
+              f"({format_size(total)})")
+
+        if self.dry_run:
+            for digest, size in missing.items():
+                print(f"  - {blob_filename(digest)} ({format_size(size or 0)})")
+            return True
+
+        (self.dst_dir / "blobs").mkdir(parents=True, exist_ok=True)
+        start_time = time.monotonic()
+        failed = []
+
+        for n, digest in enumerate(missing, 1):
+            print(f"\n[{n}/{len(missing)}] {blob_filename(digest)}")
+            try:
+                self.copy_blob(digest)
+            except (OSError, ValueError) as e:
+                print(f"  ❌ {e}")
+                failed.append(digest)
+
+        for path in manifests:
+            if not set(manifest_blobs(path)) & set(failed):
+                self.copy_manifest(path)
+
+        elapsed = time.monotonic() - start_time
+        rate = self.bytes_copied / elapsed if elapsed > 0 else 0
+
+        print(f"\n{'='*60}")
+        print("SYNC SUMMARY")
+        print(f"{'='*60}")
+        print(f"Copied:     {format_size(self.bytes_copied)}")
+        print(f"Time:       {elapsed:.1f}s")
+        print(f"Throughput: {format_size(rate)}/s")
+        print(f"Failed:     {len(failed)}")
+        print(f"{'='*60}")
+
+        return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sync Ollama model blobs between model directories")
+    parser.add_argument("src", help="Source Ollama models directory")
+    parser.add_argument("dst", help="Target Ollama models directory")
+    parser.add_argument("models", nargs="*",
+                        help="Models to sync, e.g. dolphin-llama3:8b (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=4,
+                        help="Parallel chunk transfers per blob (default: 4)")
+    parser.add_argument("--chunk-mb", type=int, default=16,
+                        help="Chunk size in MB (default: 16)")
+    parser.add_argument("--verify-existing", action="store_true",
+                        help="Hash blobs already on the target instead of trusting size")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only list the blobs that would be copied")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Ollama Model Blob Sync")
+    print("="*60)
+    print(f"Source: {args.src}")
+    print(f"Target: {args.dst}")
+
+    syncer = BlobSyncer(
+        args.src, args.dst,
+        workers=max(1, args.workers),
+        chunk_size=max(1, args.chunk_mb) * 1024 * 1024,
+        verify_existing=args.verify_existing,
+        dry_run=args.dry_run,
+    )
+
+    try:
+        ok = syncer.sync(args.models)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()